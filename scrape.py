@@ -1,208 +1,525 @@
 import praw
-import pandas as pd
+from praw.models import MoreComments
+import io
 import logging
 import os
-import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from requests import Session as HTTPSession
+from requests.adapters import HTTPAdapter
+from sqlalchemy import create_engine, inspect
+from sqlalchemy import BigInteger, Column, Float, MetaData, Table, Text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import func
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Log level from .env (a level name such as DEBUG, or a number; default to INFO)
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").strip().upper()
+log_level = int(LOG_LEVEL) if LOG_LEVEL.isdigit() else getattr(logging, LOG_LEVEL, None)
+
 # Set up logging
 logging.basicConfig(
-    level=logging.DEBUG,  # Set to DEBUG for detailed logs
+    level=log_level if isinstance(log_level, int) else logging.INFO,  # Set LOG_LEVEL=DEBUG in .env for detailed logs
     format="%(asctime)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler()]  # This ensures logs go to stdout
 )
 
+if not isinstance(log_level, int):
+    logging.warning("Unknown LOG_LEVEL %r, falling back to INFO.", LOG_LEVEL)
+
 # Reddit API credentials from .env
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
 
+# Function to create a PRAW Reddit instance (PRAW paces requests using the X-Ratelimit-* response headers)
+def create_reddit():
+    # HTTP session with a keep-alive connection pool, so Reddit requests reuse
+    # open TCP/TLS connections instead of reconnecting
+    http_session = HTTPSession()
+    http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+    return praw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT,
+        requestor_kwargs={"session": http_session}
+    )
+
+
 # Initialize PRAW Reddit instance
-reddit = praw.Reddit(
-    client_id=REDDIT_CLIENT_ID,
-    client_secret=REDDIT_CLIENT_SECRET,
-    user_agent=REDDIT_USER_AGENT
-)
+reddit = create_reddit()
 
 # Database URL from .env
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Shared database engine and session factory (reuses pooled connections)
+ENGINE = create_engine(
+    DATABASE_URL,
+    pool_size=4,
+    max_overflow=0,
+    pool_recycle=1800,
+    pool_pre_ping=True
+)
+Session = sessionmaker(bind=ENGINE)
+
 # Subreddits to scrape from .env (comma-separated)
 SUBREDDITS = os.getenv("SUBREDDITS").split(',')
 
-# Rate limit from .env (default to 5 seconds if not set)
-RATE_LIMIT = int(os.getenv("RATE_LIMIT", 5))
-
 # Scrape posts and comments options from .env
 SCRAPE_POSTS = os.getenv("SCRAPE_POSTS", "True") == "True"
 SCRAPE_COMMENTS = os.getenv("SCRAPE_COMMENTS", "True") == "True"
 
+# Maximum number of subreddits scraped in parallel from .env (one process each)
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", 4))
+
+# Insert method from .env: "copy" (PostgreSQL COPY, fastest), "values" (psycopg2 execute_values,
+# for PostgreSQL roles where COPY is unavailable) or "multi" (multi-row INSERTs for other databases)
+INSERT_METHOD = os.getenv("INSERT_METHOD", "copy").lower()
+if INSERT_METHOD not in ("copy", "values", "multi"):
+    raise ValueError(f"Unknown INSERT_METHOD {INSERT_METHOD!r}, expected one of: copy, values, multi")
+
+# Rows per multi-row INSERT / execute_values page (PostgreSQL throughput plateaus around 1000)
+INSERT_CHUNKSIZE = 1000
+
+# Rows buffered in memory before they are flushed to the database
+BATCH_SIZE = 5000
+
+# Posts whose comments are committed together (amortizes the per-commit WAL fsync)
+FLUSH_EVERY = 50
+
+# Columns of post and comment rows, in the order each row tuple is built
+POST_COLUMNS = (
+    "post_id", "post_title", "post_body", "post_author", "post_score", "post_created_utc",
+    "post_permalink", "post_num_comments", "post_url", "post_subreddit"
+)
+COMMENT_COLUMNS = (
+    "comment_id", "comment_body", "comment_author", "comment_score", "comment_created_utc",
+    "comment_permalink", "post_id", "parent_comment_id"
+)
+
+# Table holding both post rows and comment rows (comment rows link to their post via post_id)
+metadata = MetaData()
+posts_comments_table = Table(
+    "reddit_posts_comments", metadata,
+    Column("post_id", Text),
+    Column("post_title", Text),
+    Column("post_body", Text),
+    Column("post_author", Text),
+    Column("post_score", BigInteger),
+    Column("post_created_utc", Float(precision=53)),
+    Column("post_permalink", Text),
+    Column("post_num_comments", BigInteger),
+    Column("post_url", Text),
+    Column("post_subreddit", Text),
+    Column("comment_id", Text),
+    Column("comment_body", Text),
+    Column("comment_author", Text),
+    Column("comment_score", BigInteger),
+    Column("comment_created_utc", Float(precision=53)),
+    Column("comment_permalink", Text),
+    Column("parent_comment_id", Text)
+)
+
 from sqlalchemy import text
 
-def get_earliest_post_timestamp(subreddit_name):
+# Function to create the table and its indexes (the unique comment index used to skip duplicate rows,
+# and the subreddit/timestamp index used to resume post scraping) if they do not exist yet
+def create_table():
+    table_name = posts_comments_table.name
+
+    try:
+        metadata.create_all(ENGINE)
+
+        with ENGINE.begin() as conn:
+            # Tables created by earlier versions (pandas to_sql) only have the columns of whichever
+            # rows were saved first, so add any columns of posts_comments_table that are missing
+            existing_columns = {column["name"] for column in inspect(conn).get_columns(table_name)}
+            for column in posts_comments_table.columns:
+                if column.name not in existing_columns:
+                    logging.info("Adding missing column %s to %s.", column.name, table_name)
+                    conn.execute(text(
+                        f'ALTER TABLE {table_name} ADD COLUMN "{column.name}" {column.type.compile(dialect=conn.dialect)}'
+                    ))
+
+            # The indexes below rely on PostgreSQL/SQLite DDL (IF NOT EXISTS, indexes on TEXT columns);
+            # other databases get no unique index, and insert_multi falls back to plain INSERTs there
+            if conn.dialect.name not in ("postgresql", "sqlite"):
+                logging.warning("Not creating indexes on %s; duplicate comment rows will not be skipped.",
+                                conn.dialect.name)
+                return
+
+            existing_indexes = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+
+            if "uq_comment" not in existing_indexes:
+                # Comments-only runs of earlier versions (SCRAPE_POSTS=False) re-saved every earlier
+                # post's comments after each post, leaving duplicate comment rows that would make the
+                # unique index fail; keep one row per comment_id before creating it (same transaction)
+                if conn.dialect.name == "postgresql":
+                    result = conn.execute(text(f"""
+                        DELETE FROM {table_name} a
+                        USING {table_name} b
+                        WHERE a.comment_id = b.comment_id AND a.ctid > b.ctid
+                    """))
+                else:
+                    result = conn.execute(text(f"""
+                        DELETE FROM {table_name}
+                        WHERE comment_id IS NOT NULL AND rowid NOT IN (
+                            SELECT MIN(rowid) FROM {table_name}
+                            WHERE comment_id IS NOT NULL
+                            GROUP BY comment_id
+                        )
+                    """))
+
+                if result.rowcount:
+                    logging.info("Removed %s duplicate comment rows before creating the unique index.", result.rowcount)
+
+                conn.execute(text(f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS uq_comment
+                    ON {table_name} (comment_id)
+                """))
+
+            if "ix_post_subreddit_created_utc" not in existing_indexes:
+                # Lets get_latest_post find a subreddit's newest post without scanning and sorting the table
+                conn.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS ix_post_subreddit_created_utc
+                    ON {table_name} (post_subreddit, post_created_utc)
+                """))
+    except SQLAlchemyError as e:
+        # Without the table or the unique index, inserts cannot skip duplicate rows, so stop here
+        logging.error("Error occurred while creating the table: %s", e)
+        raise
+
+
+def get_scraped_post_ids():
     try:
         # Create a session to query the database
-        engine = create_engine(DATABASE_URL)
-        Session = sessionmaker(bind=engine)
         session = Session()
-        
-        # Use raw SQL to get the earliest post timestamp
+
+        # Use raw SQL to get the IDs of posts whose comments are already stored
+        # (post IDs are unique across Reddit, so no subreddit filter is needed)
         query = text("""
-            SELECT MIN(post_created_utc) 
-            FROM reddit_posts_comments 
+            SELECT DISTINCT post_id
+            FROM reddit_posts_comments
+            WHERE comment_id IS NOT NULL
+        """)
+
+        result = set(session.execute(query).scalars())
+
+        session.close()
+
+        return result
+
+    except SQLAlchemyError as e:
+        logging.error("Error occurred while fetching already scraped post IDs: %s", e)
+        return set()
+
+
+def get_latest_post(subreddit_name):
+    try:
+        # Create a session to query the database
+        session = Session()
+
+        # Use raw SQL to get the ID and timestamp of the newest stored post (only post rows have
+        # post_subreddit set, so this reads ix_post_subreddit_created_utc backwards)
+        query = text("""
+            SELECT post_id, post_created_utc
+            FROM reddit_posts_comments
             WHERE post_subreddit = :subreddit_name
+            ORDER BY post_created_utc DESC
+            LIMIT 1
         """)
-        
-        result = session.execute(query, {"subreddit_name": subreddit_name}).scalar()
+
+        result = session.execute(query, {"subreddit_name": subreddit_name}).first()
 
         session.close()
 
         if result:
-            return result
+            return result.post_id, result.post_created_utc
         else:
-            return None
+            return None, None
 
     except SQLAlchemyError as e:
-        logging.error(f"Error occurred while fetching the earliest post timestamp: {e}")
-        return None
+        logging.error("Error occurred while fetching the latest post: %s", e)
+        return None, None
 
 
 # Function to scrape posts from a subreddit
 def scrape_posts(subreddit_name):
     try:
         subreddit = reddit.subreddit(subreddit_name)
-        
-        # List to store all posts
+
+        # Find the newest stored post so a resumed run can stop once it reaches already saved posts
+        latest_post_id, latest_post_created_utc = get_latest_post(subreddit_name)
+
+        # List to store the current batch of posts, and a running total of posts saved
         post_data = []
+        post_count = 0
 
         # Log the start of the scraping process
-        logging.info(f"Started scraping posts from subreddit: {subreddit_name}")
+        logging.info("Started scraping posts from subreddit: %s", subreddit_name)
 
         # Loop through the posts
         for post in subreddit.new(limit=None):  # "new" for all posts in reverse chronological order
-            logging.info(f"Scraping post: {post.title}, permalink: {post.permalink}")
-            
-            # Post metadata
-            post_data.append({
-                "post_id": post.id,
-                "post_title": post.title,
-                "post_body": post.selftext,
-                "post_author": post.author.name if post.author else None,
-                "post_score": post.score,
-                "post_created_utc": post.created_utc,
-                "post_permalink": post.permalink,
-                "post_num_comments": post.num_comments,
-                "post_url": post.url,
-                "post_subreddit": post.subreddit.display_name
-            })
-
-            # Sleep to rate limit requests (configurable from RATE_LIMIT)
-            logging.info(f"Sleeping for {RATE_LIMIT} seconds.")
-            time.sleep(RATE_LIMIT)
-
-        # Convert to DataFrame
-        post_df = pd.DataFrame(post_data)
-
-        # Save to the database
-        save_to_database(post_df)
-
-        logging.info(f"Successfully scraped and saved {len(post_data)} posts from subreddit: {subreddit_name}")
-        return post_df
+            # Every post from here on is already stored, so stop paging through the listing
+            if latest_post_id and (post.id == latest_post_id or post.created_utc < latest_post_created_utc):
+                logging.info("Reached already scraped post %s, stopping.", post.id)
+                break
+
+            logging.info("Scraping post: %s, permalink: %s", post.title, post.permalink)
+
+            # Post metadata (in POST_COLUMNS order)
+            post_data.append((
+                post.id,
+                post.title,
+                post.selftext,
+                post.author.name if post.author else None,
+                post.score,
+                post.created_utc,
+                post.permalink,
+                post.num_comments,
+                post.url,
+                post.subreddit.display_name
+            ))
+
+            # Flush full batches so memory stays bounded by BATCH_SIZE rows
+            if len(post_data) >= BATCH_SIZE:
+                if save_to_database(POST_COLUMNS, post_data):
+                    post_count += len(post_data)
+                post_data = []
+
+        # Save the remaining posts to the database
+        if post_data and save_to_database(POST_COLUMNS, post_data):
+            post_count += len(post_data)
+
+        logging.info("Successfully scraped and saved %s posts from subreddit: %s", post_count, subreddit_name)
+        return post_count
 
     except Exception as e:
-        logging.error(f"Error occurred while scraping posts from subreddit {subreddit_name}: {e}")
-        return pd.DataFrame()
+        logging.error("Error occurred while scraping posts from subreddit %s: %s", subreddit_name, e)
+        return 0
+
+
+# Walk a comment forest breadth-first, yielding comments one at a time instead of building
+# the flattened list that CommentForest.list() returns
+def walk_comments(comment_forest):
+    queue = deque(comment_forest)
+    while queue:
+        comment = queue.popleft()
+        if isinstance(comment, MoreComments):
+            continue
+        queue.extend(comment.replies)
+        yield comment
+
+
+# Wait for a pending background save and return the number of rows it actually wrote
+def wait_for_save(pending):
+    if pending is None:
+        return 0
+    future, count = pending
+    return count if future.result() else 0
+
+
+# Hand the buffered rows to the background writer and empty the buffer, so each row is only
+# saved once. The previous save is waited for first, so at most one batch is in flight.
+# Returns the new pending save and the number of rows the previous one wrote.
+def flush_rows(writer, pending, columns, rows):
+    saved = wait_for_save(pending)
+    pending = (writer.submit(save_to_database, columns, rows.copy()), len(rows)) if rows else None
+    rows.clear()
+    return pending, saved
 
 
 # Function to scrape comments from a subreddit
-def scrape_comments(subreddit_name):
+# (scraped_post_ids: posts whose comments are already stored, so a resumed run can skip them)
+def scrape_comments(subreddit_name, scraped_post_ids):
     try:
         subreddit = reddit.subreddit(subreddit_name)
 
-        # Find the earliest post timestamp to resume scraping from
-        earliest_post_timestamp = get_earliest_post_timestamp(subreddit_name)
-        
-        # List to store all comments
+        # List to store the comments of the current batch of posts, the save still in flight,
+        # and running totals
         comment_data = []
+        pending = None
+        batch_posts = 0
+        comment_count = 0
 
         # Log the start of the scraping process
-        logging.info(f"Started scraping comments from subreddit: {subreddit_name}")
-
-        # Loop through the posts
-        for post in subreddit.new(limit=None):  # "new" for all posts in reverse chronological order
-            if earliest_post_timestamp and post.created_utc <= earliest_post_timestamp:
-                logging.info(f"Skipping post {post.id} as it is older than the earliest post timestamp.")
-                continue
-
-            logging.info(f"Scraping post: {post.title}, permalink: {post.permalink}")
-            
-            # Scraping comments related to the post
-            post.comments.replace_more(limit=0)  # Ensure all comments are loaded
-            for comment in post.comments.list():  # Iterate through all comments on the post
-                comment_data.append({
-                    "comment_id": comment.id,
-                    "comment_body": comment.body,
-                    "comment_author": comment.author.name if comment.author else None,
-                    "comment_score": comment.score,
-                    "comment_created_utc": comment.created_utc,
-                    "comment_permalink": f"https://www.reddit.com{comment.permalink}",
-                    "post_id": post.id,  # Linking the comment to the post
-                    "parent_comment_id": comment.parent().id if comment.parent() else None  # Parent comment ID
-                })
-
-            # Sleep to rate limit requests (configurable from RATE_LIMIT)
-            logging.info(f"Sleeping for {RATE_LIMIT} seconds.")
-            time.sleep(RATE_LIMIT)
-
-            # Append data to the database immediately after processing each post and its comments
-            save_to_database(pd.DataFrame(comment_data))
-
-        logging.info(f"Successfully scraped and saved {len(comment_data)} comments from subreddit: {subreddit_name}")
-        return pd.DataFrame(comment_data)
+        logging.info("Started scraping comments from subreddit: %s", subreddit_name)
+
+        # Background writer so saving a batch of comments overlaps fetching the next posts
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            # Loop through the posts
+            for post in subreddit.new(limit=None):  # "new" for all posts in reverse chronological order
+                post_id = post.id
+
+                if post_id in scraped_post_ids:
+                    logging.debug("Skipping post %s as its comments have already been scraped.", post_id)
+                    continue
+
+                # Posts without comments never get comment rows, so they would never enter the set
+                # above; skip them from the listing's count instead of requesting an empty thread
+                if post.num_comments == 0:
+                    logging.debug("Skipping post %s as it has no comments.", post_id)
+                    continue
+
+                logging.info("Scraping post: %s, permalink: %s", post.title, post.permalink)
+
+                # Scraping comments related to the post
+                post.comments.replace_more(limit=0)  # Ensure all comments are loaded
+                for comment in walk_comments(post.comments):  # Iterate through all comments on the post
+                    # Comment row (in COMMENT_COLUMNS order)
+                    comment_data.append((
+                        comment.id,
+                        comment.body,
+                        comment.author.name if comment.author else None,
+                        comment.score,
+                        comment.created_utc,
+                        f"https://www.reddit.com{comment.permalink}",
+                        post_id,  # Linking the comment to the post (the only post field stored per comment)
+                        # Parent comment ID, taken from the "t1_"/"t3_" fullname so no parent object is loaded
+                        comment.parent_id.split("_", 1)[1] if comment.parent_id else None
+                    ))
+
+                # Hand every FLUSH_EVERY posts' comments (or BATCH_SIZE rows, whichever comes first)
+                # to the writer as one transaction; only checked between posts so each post's
+                # comments are always committed together
+                batch_posts += 1
+                if batch_posts >= FLUSH_EVERY or len(comment_data) >= BATCH_SIZE:
+                    pending, saved = flush_rows(writer, pending, COMMENT_COLUMNS, comment_data)
+                    comment_count += saved
+                    batch_posts = 0
+
+            # Save the remaining comments to the database and wait for the last save
+            pending, saved = flush_rows(writer, pending, COMMENT_COLUMNS, comment_data)
+            comment_count += saved + wait_for_save(pending)
+
+        logging.info("Successfully scraped and saved %s comments from subreddit: %s", comment_count, subreddit_name)
+        return comment_count
 
     except Exception as e:
-        logging.error(f"Error occurred while scraping comments from subreddit {subreddit_name}: {e}")
-        return pd.DataFrame()
+        logging.error("Error occurred while scraping comments from subreddit %s: %s", subreddit_name, e)
+        return 0
+
+
+# Bulk-load rows with PostgreSQL COPY, skipping rows that are already stored
+def psql_insert_copy(conn, columns, rows):
+    # Write the rows to an in-memory CSV buffer. COPY reads an unquoted empty field as NULL and a
+    # quoted one as an empty string, so None is written empty and every other value is quoted
+    # (csv.writer cannot quote only non-None values before Python 3.12)
+    buf = io.StringIO()
+    for row in rows:
+        buf.write(",".join(
+            "" if value is None else '"' + str(value).replace('"', '""') + '"' for value in row
+        ))
+        buf.write("\n")
+    buf.seek(0)
+
+    table_name = posts_comments_table.name
+    column_list = ", ".join(f'"{c}"' for c in columns)
+
+    # COPY into a temporary staging table (dropped on commit), then move the rows over with
+    # ON CONFLICT DO NOTHING since COPY itself cannot skip duplicates
+    with conn.connection.cursor() as cur:
+        cur.execute(f"CREATE TEMP TABLE tmp_{table_name} (LIKE {table_name}) ON COMMIT DROP")
+        cur.copy_expert(f"COPY tmp_{table_name} ({column_list}) FROM STDIN WITH (FORMAT CSV)", buf)
+        cur.execute(f"""
+            INSERT INTO {table_name} ({column_list})
+            SELECT {column_list} FROM tmp_{table_name}
+            ON CONFLICT DO NOTHING
+        """)
 
 
-# Function to save data to the database
-def save_to_database(df):
-    try:
-        # Create database engine
-        engine = create_engine(DATABASE_URL)
+# Insert rows with psycopg2's execute_values, skipping rows that are already stored
+def psql_insert_values(conn, columns, rows):
+    from psycopg2.extras import execute_values
+
+    column_list = ", ".join(f'"{c}"' for c in columns)
+
+    # One multi-row VALUES statement per page of INSERT_CHUNKSIZE rows
+    with conn.connection.cursor() as cur:
+        execute_values(cur, f"INSERT INTO {posts_comments_table.name} ({column_list}) VALUES %s ON CONFLICT DO NOTHING",
+                       rows, page_size=INSERT_CHUNKSIZE)
+
+
+# Insert rows as multi-row INSERT statements (works on any database SQLAlchemy supports)
+def insert_multi(conn, columns, rows):
+    # Skip rows that are already stored where the dialect supports ON CONFLICT DO NOTHING
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        statement = insert(posts_comments_table).on_conflict_do_nothing()
+    elif conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        statement = insert(posts_comments_table).on_conflict_do_nothing()
+    else:
+        statement = posts_comments_table.insert()
+
+    for start in range(0, len(rows), INSERT_CHUNKSIZE):
+        chunk = [dict(zip(columns, row)) for row in rows[start:start + INSERT_CHUNKSIZE]]
+        conn.execute(statement.values(chunk))
+
 
-        # Save DataFrame to PostgreSQL
-        df.to_sql('reddit_posts_comments', con=engine, if_exists='append', index=False)
+# Function to save rows (tuples in the order of columns) to the database; returns whether the rows were saved
+def save_to_database(columns, rows):
+    try:
+        # Save rows to PostgreSQL in one transaction (bulk-loaded via COPY unless configured otherwise)
+        with ENGINE.begin() as conn:
+            if INSERT_METHOD == "values":
+                psql_insert_values(conn, columns, rows)
+            elif INSERT_METHOD == "multi":
+                insert_multi(conn, columns, rows)
+            else:
+                psql_insert_copy(conn, columns, rows)
         logging.info("Data saved to the database successfully.")
+        return True
     except SQLAlchemyError as e:
-        logging.error(f"Database error: {e}")
+        logging.error("Database error: %s", e)
     except Exception as e:
-        logging.error(f"Error saving to the database: {e}")
+        logging.error("Error saving to the database: %s", e)
+    return False
+
+
+# Posts whose comments are already stored (loaded once in the main process and handed to each worker,
+# since the set is not filtered by subreddit)
+scraped_post_ids = set()
+
+
+# Give each worker process its own Reddit client and database connections, plus the scraped post IDs
+def init_worker(post_ids):
+    global reddit, scraped_post_ids
+    reddit = create_reddit()
+    scraped_post_ids = post_ids
+
+    # Drop pooled connections inherited from the parent process without closing them under it
+    ENGINE.dispose(close=False)
+
+
+# Function to scrape posts and/or comments from a subreddit (runs in a worker process)
+def scrape_subreddit(subreddit_name):
+    post_count = scrape_posts(subreddit_name) if SCRAPE_POSTS else None
+    comment_count = scrape_comments(subreddit_name, scraped_post_ids) if SCRAPE_COMMENTS else None
+    return subreddit_name, post_count, comment_count
 
 
 # Main execution
 if __name__ == "__main__":
-    # Scrape posts or comments based on the .env configuration
-    for subreddit_name in SUBREDDITS:
-        if SCRAPE_POSTS:
-            post_df = scrape_posts(subreddit_name.strip())
+    # Make sure the table exists before any rows are written
+    create_table()
 
-        if SCRAPE_COMMENTS:
-            comment_df = scrape_comments(subreddit_name.strip())
+    # Find the posts whose comments were already scraped once for all subreddits
+    scraped_post_ids = get_scraped_post_ids() if SCRAPE_COMMENTS else set()
 
-        # Display the results (first 5 rows for inspection)
-        if 'post_df' in locals() and not post_df.empty:
-            print(f"Results from {subreddit_name} (Posts):\n", post_df.head())
+    # Scrape posts or comments based on the .env configuration, several subreddits at a time
+    subreddit_names = [subreddit_name.strip() for subreddit_name in SUBREDDITS]
+    max_workers = min(len(subreddit_names), MAX_WORKERS)
 
-        if 'comment_df' in locals() and not comment_df.empty:
-            print(f"Results from {subreddit_name} (Comments):\n", comment_df.head())
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(scraped_post_ids,)) as executor:
+        for subreddit_name, post_count, comment_count in executor.map(scrape_subreddit, subreddit_names):
+            if SCRAPE_POSTS:
+                print(f"Results from {subreddit_name} (Posts): {post_count} posts saved")
 
-        # Clean up local variables to avoid carrying over to next subreddit
-        del post_df, comment_df
+            if SCRAPE_COMMENTS:
+                print(f"Results from {subreddit_name} (Comments): {comment_count} comments saved")